@@ -13,11 +13,239 @@ import bmesh
 import os
 import shutil
 import random
+import logging
 import numpy as np
-from mathutils import Vector
-from skimage.measure import marching_cubes
 from bpy.props import FloatProperty, IntProperty, PointerProperty
 from bpy.types import Operator, Panel, PropertyGroup
+from bpy.app.handlers import persistent
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; smoothing falls back to NumPy
+    njit = None
+
+try:
+    import scipy.sparse as sp
+    from scipy.sparse.linalg import splu
+except ImportError:  # SciPy is optional; implicit smoothing falls back to iterating
+    sp = None
+
+DEBUG = False  # Print diagnostics from the selection and smoothing tools
+log = logging.getLogger(__name__)
+
+
+def _f32(n):
+    """Allocates a float32 buffer, matching Blender's C floats so foreach_get/set take the fast path."""
+    return np.empty(n, dtype=np.single)
+
+
+# Mesh pointer -> (edge vertex pairs, (indptr, indices, deg)) of the last adjacency built for it
+_csr_cache = {}
+
+
+def _edge_csr(mesh):
+    """Returns the symmetric CSR vertex adjacency (indptr, indices, deg) of the mesh edges, cached per mesh."""
+    num_verts = len(mesh.vertices)
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+
+    # Smoothing moves vertices but keeps the topology, so the adjacency can be reused
+    cached = _csr_cache.get(mesh.as_pointer())
+    if cached and len(cached[1][2]) == num_verts and np.array_equal(cached[0], edges):
+        return cached[1]
+
+    # Each edge is stored in both directions, grouped by source vertex
+    pairs = edges.reshape(-1, 2)
+    rows = np.concatenate((pairs[:, 0], pairs[:, 1]))
+    cols = np.concatenate((pairs[:, 1], pairs[:, 0]))
+    indices = cols[np.argsort(rows, kind='stable')]
+
+    deg = np.bincount(rows, minlength=num_verts)
+    indptr = np.zeros(num_verts + 1, dtype=np.int64)
+    np.cumsum(deg, out=indptr[1:])
+
+    _csr_cache[mesh.as_pointer()] = (edges, (indptr, indices, deg))
+    return indptr, indices, deg
+
+
+def _csr_sum(values, indptr, deg):
+    """Sums per-edge values (in CSR order) for each vertex; isolated vertices get zero."""
+    out = np.zeros((len(deg),) + values.shape[1:], dtype=values.dtype)
+    nonempty = deg > 0
+    if len(values):
+        out[nonempty] = np.add.reduceat(values, indptr[:-1][nonempty], axis=0)
+    return out
+
+
+def _loop_face_indices(mesh):
+    """Returns the polygon index owning each loop of the mesh."""
+    num_faces = len(mesh.polygons)
+    loop_start = np.empty(num_faces, dtype=np.int32)
+    loop_total = np.empty(num_faces, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+    mesh.polygons.foreach_get("loop_total", loop_total)
+
+    # Offset of each loop within its polygon, shifted to the polygon's loop_start
+    face_of_loop = np.repeat(np.arange(num_faces, dtype=np.int32), loop_total)
+    first = np.cumsum(loop_total) - loop_total
+    loop_index = np.arange(len(face_of_loop)) + np.repeat(loop_start - first, loop_total)
+
+    loop_face = np.empty(len(mesh.loops), dtype=np.int32)
+    loop_face[loop_index] = face_of_loop
+    return loop_face
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _laplacian_csr(src, dst, rows, indptr, indices):
+        """Writes the average of each listed vertex and its CSR neighbors from src into dst."""
+        for k in prange(rows.shape[0]):
+            i = rows[k]
+            sx, sy, sz = src[i, 0], src[i, 1], src[i, 2]
+            for p in range(indptr[k], indptr[k + 1]):
+                j = indices[p]
+                sx += src[j, 0]
+                sy += src[j, 1]
+                sz += src[j, 2]
+            count = indptr[k + 1] - indptr[k] + 1
+            dst[i, 0] = sx / count
+            dst[i, 1] = sy / count
+            dst[i, 2] = sz / count
+else:
+    _laplacian_csr = None
+
+
+def _uniform_laplacian(indptr, indices, deg):
+    """Builds the uniform Laplacian I - D^-1 A from the CSR adjacency; isolated vertices get empty rows."""
+    num_verts = len(deg)
+    adjacency = sp.csr_matrix((np.ones(len(indices)), indices, indptr), shape=(num_verts, num_verts))
+    return sp.diags((deg > 0).astype(np.float64)) - sp.diags(1.0 / np.maximum(deg, 1)) @ adjacency
+
+
+def _cotangent_laplacian(mesh, co):
+    """Builds the cotangent Laplacian and lumped vertex areas, computing each triangle's area only once."""
+    num_verts = len(co)
+    mesh.calc_loop_triangles()
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", tris)
+    tris = tris.reshape(-1, 3)
+    corners = co.astype(np.float64)[tris]
+
+    # |e1 x e2| is twice the area; it is shared by all three corner cotangents and the mass
+    double_area = np.linalg.norm(np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]), axis=1)
+    double_area = np.maximum(double_area, 1e-12)  # Degenerate triangles
+
+    # The edge opposite each corner gets half the cotangent of that corner's angle
+    rows, cols, weights = [], [], []
+    for k in range(3):
+        i, j = (k + 1) % 3, (k + 2) % 3
+        u = corners[:, i] - corners[:, k]
+        v = corners[:, j] - corners[:, k]
+        half_cot = 0.5 * (u * v).sum(axis=1) / double_area
+        rows += [tris[:, i], tris[:, j]]
+        cols += [tris[:, j], tris[:, i]]
+        weights += [half_cot, half_cot]
+    stiffness = sp.csr_matrix((np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))),
+                              shape=(num_verts, num_verts))
+    laplacian = sp.diags(np.asarray(stiffness.sum(axis=1)).ravel()) - stiffness
+
+    # Lumped mass: a third of each adjacent triangle's area
+    mass = np.bincount(tris.ravel(), weights=np.repeat(double_area / 6, 3), minlength=num_verts)
+    return laplacian, mass
+
+
+def _implicit_smooth(co, rows, laplacian, mass, strength):
+    """Solves (M + strength * L) X = M X0 in place for the given rows, holding every other vertex fixed."""
+    rows = rows[mass[rows] > 0]  # Vertices without area (loose or wire-only) cannot be smoothed
+    if not len(rows):
+        return
+    fixed = np.ones(len(co), dtype=bool)
+    fixed[rows] = False
+
+    # Fixed neighbors move to the right-hand side; one factorization solves x, y and z
+    system = (sp.diags(mass) + strength * laplacian).tocsr()[rows]
+    x0 = co.astype(np.float64)
+    rhs = mass[rows, None] * x0[rows] - system[:, fixed] @ x0[fixed]
+    co[rows] = splu(system[:, rows].tocsc()).solve(rhs)
+
+
+def _read_uvs(mesh):
+    """Reads the active UV layer as an (n_loops, 2) float32 array."""
+    num_loops = len(mesh.loops)
+    uvs = _f32(num_loops * 2)
+    mesh.uv_layers.active.data.foreach_get("uv", uvs)
+    return uvs.reshape(num_loops, 2)
+
+
+def _uv_tile_buckets(mesh):
+    """Groups faces by 0.1 UV tile in one pass over the loops, as {(tile_x, tile_y): face index array}."""
+    num_faces = len(mesh.polygons)
+    # Scale in double precision so tile boundaries match Python float math
+    tiles = (_read_uvs(mesh).astype(np.float64) * 10).astype(np.int64)
+
+    # Pack (tile_x, tile_y) into one key; tile_y is offset to stay non-negative
+    keys = tiles[:, 0] * 2**32 + (tiles[:, 1] + 2**31)
+    tile_keys, loop_tile = np.unique(keys, return_inverse=True)
+
+    # Unique (tile, face) pairs, sorted by tile and then face
+    pairs = np.unique(loop_tile.ravel() * num_faces + _loop_face_indices(mesh))
+    pair_tile, pair_face = np.divmod(pairs, num_faces)
+    bounds = np.searchsorted(pair_tile, np.arange(1, len(tile_keys)))
+
+    tile_dict = {}
+    for key, face_ids in zip(tile_keys.tolist(), np.split(pair_face, bounds)):
+        tile_dict[(key // 2**32, key % 2**32 - 2**31)] = face_ids
+    return tile_dict
+
+
+def _write_positions(mesh, co):
+    """Writes an (n, 3) position array back to an object-mode mesh."""
+    flat_co = np.ascontiguousarray(co, dtype=np.single).ravel()
+    # Blender 3.5+ stores positions as a generic attribute, which skips MeshVertex
+    if hasattr(mesh, "attributes") and "position" in mesh.attributes:
+        mesh.attributes["position"].data.foreach_set("vector", flat_co)
+    else:
+        mesh.vertices.foreach_set("co", flat_co)
+    mesh.update()
+
+
+# Material name -> (image name, width, height) of its first image texture node
+_tex_cache = {}
+
+
+def _material_texture(mat):
+    """Returns (image, width, height) for the material's first image texture node, or None."""
+    cached = _tex_cache.get(mat.name_full)
+    if cached:
+        image = bpy.data.images.get(cached[0])
+        if image:
+            return image, cached[1], cached[2]
+
+    if mat.use_nodes:
+        for node in mat.node_tree.nodes:
+            if node.type == 'TEX_IMAGE' and node.image:
+                width, height = node.image.size[:2]
+                _tex_cache[mat.name_full] = (node.image.name, width, height)
+                return node.image, width, height
+    return None
+
+
+@persistent
+def _invalidate_tex_cache(scene, depsgraph=None):
+    """Drops cached texture lookups when materials or images change, or on undo and file load."""
+    if depsgraph is None:
+        _tex_cache.clear()
+        return
+    for update in depsgraph.updates:
+        if isinstance(update.id, (bpy.types.Material, bpy.types.Image, bpy.types.NodeTree)):
+            _tex_cache.clear()
+            return
+
+
+@persistent
+def _clear_csr_cache(*args):
+    """Forgets cached adjacencies once undo or file load may have replaced the meshes."""
+    _csr_cache.clear()
 
 class UVTileProperties(PropertyGroup):
     tile_x: IntProperty(name="Tile X", default=0, min=0)
@@ -44,12 +272,9 @@ class SmoothVoxelTerrainPanel(Panel):
 
         obj = context.active_object
         if obj and obj.type == 'MESH' and obj.active_material:
-            mat = obj.active_material
-            if mat.use_nodes:
-                for node in mat.node_tree.nodes:
-                    if node.type == 'TEX_IMAGE' and node.image:
-                        layout.template_preview(node.image, show_buttons=False)
-                        break
+            texture = _material_texture(obj.active_material)
+            if texture:
+                layout.template_preview(texture[0], show_buttons=False)
         
         row = layout.row()
         row.prop(uv_props, "tile_x", text="Tile X")
@@ -91,13 +316,14 @@ def duplicate_texture_folder(original_folder, new_folder):
     texture_folder_path = os.path.join(new_folder, "texture")
     os.makedirs(texture_folder_path, exist_ok=True)
 
-    for file_name in os.listdir(original_folder):
-        old_path = os.path.join(original_folder, file_name)
-        new_path = os.path.join(texture_folder_path, file_name)
+    # scandir caches the file type, and copyfile uses the OS fast copy paths
+    with os.scandir(original_folder) as entries:
+        files = [entry for entry in entries if entry.is_file()]
 
-        if os.path.isfile(old_path):
-            shutil.copy2(old_path, new_path)
-            print(f"Copied: {old_path} → {new_path}")
+    for entry in files:
+        new_path = os.path.join(texture_folder_path, entry.name)
+        shutil.copyfile(entry.path, new_path)
+        log.debug("Copied: %s → %s", entry.path, new_path)
 
 
 def export_empty_fbx_with_material(obj, export_path):
@@ -110,27 +336,17 @@ def export_empty_fbx_with_material(obj, export_path):
     bpy.context.collection.objects.link(mat_plane)
 
     # Create the plane geometry (small 0.01x0.01 unit)
-    bm = bmesh.new()
-    verts = [
-        bm.verts.new((-0.005, -0.005, 0)),  # Bottom-left
-        bm.verts.new(( 0.005, -0.005, 0)),  # Bottom-right
-        bm.verts.new(( 0.005,  0.005, 0)),  # Top-right
-        bm.verts.new((-0.005,  0.005, 0))   # Top-left
-    ]
-    bm.faces.new(verts)
-    
-    # Add UV layer
-    uv_layer = bm.loops.layers.uv.new("UVMap")
-    
-    # Set UV coordinates (covering full 0-1 range)
-    for face in bm.faces:
-        face.loops[0][uv_layer].uv = (0.0, 0.0)  # Bottom-left
-        face.loops[1][uv_layer].uv = (1.0, 0.0)  # Bottom-right
-        face.loops[2][uv_layer].uv = (1.0, 1.0)  # Top-right
-        face.loops[3][uv_layer].uv = (0.0, 1.0)  # Top-left
-
-    bm.to_mesh(mesh)
-    bm.free()
+    mesh.from_pydata([
+        (-0.005, -0.005, 0),  # Bottom-left
+        ( 0.005, -0.005, 0),  # Bottom-right
+        ( 0.005,  0.005, 0),  # Top-right
+        (-0.005,  0.005, 0),  # Top-left
+    ], [], [(0, 1, 2, 3)])
+
+    # Add UV layer covering the full 0-1 range, one UV per corner in the same order
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    uv_layer.data.foreach_set("uv", np.array([0, 0, 1, 0, 1, 1, 0, 1], dtype=np.single))
+    mesh.update()
 
     # Assign materials from the original object
     for mat in obj.data.materials:
@@ -164,7 +380,27 @@ class AutoSculptTerrainOperator(bpy.types.Operator):
         default=10,
         min=1,
         max=100,
-        description="Number of times to apply smoothing"
+        description="Number of times to apply smoothing (implicit: equivalent smoothing strength)"
+    )
+
+    smooth_method: bpy.props.EnumProperty(
+        name="Method",
+        items=[
+            ('IMPLICIT', "Implicit", "Solve one sparse linear system (requires SciPy)"),
+            ('ITERATIVE', "Iterative", "Repeat explicit Laplacian smoothing passes"),
+        ],
+        default='IMPLICIT',
+        description="How the Laplacian smoothing is applied"
+    )
+
+    laplacian_weights: bpy.props.EnumProperty(
+        name="Weights",
+        items=[
+            ('UNIFORM', "Uniform", "Every neighbor counts the same"),
+            ('COTANGENT', "Cotangent", "Weight neighbors by the mesh geometry (less drift on uneven triangles)"),
+        ],
+        default='UNIFORM',
+        description="Laplacian weights used by implicit smoothing"
     )
 
     def execute(self, context):
@@ -177,41 +413,70 @@ class AutoSculptTerrainOperator(bpy.types.Operator):
             self.report({'WARNING'}, "No valid mesh object selected")
             return {'CANCELLED'}
 
-        # Switch to Edit mode
-        bpy.ops.object.mode_set(mode='EDIT')
+        # Switch to Object mode so the mesh data holds any pending edits
+        bpy.ops.object.mode_set(mode='OBJECT')
         mesh = obj.data
-        bm = bmesh.from_edit_mesh(mesh)
+        num_verts = len(mesh.vertices)
 
         # Get selected vertices
-        selected_verts = [v for v in bm.verts if v.select]
-        if not selected_verts:
+        sel_mask = np.zeros(num_verts, dtype=bool)
+        mesh.vertices.foreach_get("select", sel_mask)
+        if not sel_mask.any():
+            bpy.ops.object.mode_set(mode='EDIT')
             self.report({'WARNING'}, "No vertices selected.")
             return {'CANCELLED'}
 
+        co = _f32(num_verts * 3)
+        mesh.vertices.foreach_get("co", co)
+        co = co.reshape(num_verts, 3)
+
         # Identify flat surface vertices
         flat_threshold = 0.01  # Tolerance for detecting flat areas
-        normals = [v.normal for v in selected_verts]
-        avg_normal = sum(normals, bm.verts[0].normal) / len(normals)
-        flat_verts = [v for v in selected_verts if (v.normal - avg_normal).length < flat_threshold]
+        normals = _f32(num_verts * 3)
+        mesh.vertices.foreach_get("normal", normals)
+        normals = normals.reshape(num_verts, 3)
+        avg_normal = normals[sel_mask].mean(axis=0)
+        flat_mask = np.linalg.norm(normals - avg_normal, axis=1) < flat_threshold
+        move_mask = sel_mask & ~flat_mask
+        movable = np.flatnonzero(move_mask)
+
+        # Keep only the adjacency rows of the vertices that move
+        indptr, indices, deg = _edge_csr(mesh)
+        move_indices = indices[np.repeat(move_mask, deg)]
+        move_deg = deg[movable]
+        move_indptr = np.zeros(len(movable) + 1, dtype=np.int64)
+        np.cumsum(move_deg, out=move_indptr[1:])
 
         # Perform Laplacian smoothing (excluding flat areas)
-        for _ in range(self.smooth_iterations):
-            new_positions = {}
-            for v in selected_verts:
-                if v in flat_verts:
-                    continue  # Skip flat areas
-
-                neighbor_positions = [e.other_vert(v).co for e in v.link_edges]
-                avg_pos = sum(neighbor_positions, v.co) / (len(neighbor_positions) + 1)
-                new_positions[v] = avg_pos
-
-            # Apply new vertex positions
-            for v, new_pos in new_positions.items():
-                v.co = new_pos
+        method = self.smooth_method
+        if method == 'IMPLICIT' and sp is None:
+            self.report({'WARNING'}, "SciPy not found, using iterative smoothing")
+            method = 'ITERATIVE'
+
+        if method == 'IMPLICIT':
+            # One unconditionally stable solve replaces the explicit passes
+            if self.laplacian_weights == 'COTANGENT':
+                laplacian, mass = _cotangent_laplacian(mesh, co)
+                # On a regular grid I - D^-1 A equals h^2 / 4 times M^-1 L (cotangent),
+                # so scale the step by the mean vertex area, which stands in for h^2
+                strength = self.smooth_iterations * mass[mass > 0].mean() / 4 if mass.any() else 0.0
+            else:
+                laplacian, mass = _uniform_laplacian(indptr, indices, deg), np.ones(num_verts)
+                strength = float(self.smooth_iterations)
+            _implicit_smooth(co, movable, laplacian, mass, strength)
+        elif _laplacian_csr is not None:
+            # Compiled kernel, ping-ponging between two buffers; fixed vertices match in both
+            out = co.copy()
+            for _ in range(self.smooth_iterations):
+                _laplacian_csr(co, out, movable, move_indptr, move_indices)
+                co, out = out, co
+        else:
+            denom = (move_deg + 1).astype(np.float32)[:, None]
+            for _ in range(self.smooth_iterations):
+                co[movable] = (_csr_sum(co[move_indices], move_indptr, move_deg) + co[movable]) / denom
 
         # Update mesh
-        bmesh.update_edit_mesh(mesh)
-        bpy.ops.object.mode_set(mode='OBJECT')
+        _write_positions(mesh, co)
 
         self.report({'INFO'}, "Terrain smoothed while preserving flat surfaces.")
         return {'FINISHED'}
@@ -236,6 +501,11 @@ class SeparateMeshByUVTilesOperator(Operator):
             self.report({'ERROR'}, "Save the blend file before exporting.")
             return {'CANCELLED'}
         
+        # Leave Edit mode once, up front: every step below reads and exports object-mode data
+        bpy.context.view_layer.objects.active = obj  # Ensure object is active
+        obj.select_set(True)  # Ensure object is selected
+        bpy.ops.object.mode_set(mode='OBJECT')
+
         blend_path = bpy.data.filepath
         blend_name = os.path.splitext(os.path.basename(blend_path))[0]  
         export_dir = os.path.join(os.path.dirname(blend_path), f"{blend_name} (Split Parts)")
@@ -252,74 +522,73 @@ class SeparateMeshByUVTilesOperator(Operator):
         duplicate_texture_folder(texture_source_folder, texture_target_folder)
 
         # Step 3: Extract unique UV tile IDs from the UV map
-        if obj and obj.type == 'MESH':
-            bpy.context.view_layer.objects.active = obj  # Ensure object is active
-            obj.select_set(True)  # Ensure object is selected
-            bpy.ops.object.mode_set(mode='EDIT')
-        else:
-            self.report({'WARNING'}, "No valid mesh object selected")
-            return {'CANCELLED'}
-
         mesh = obj.data
-        tile_dict = {}
-        bm = bmesh.from_edit_mesh(mesh)
-        uv_layer = bm.loops.layers.uv.active
+        uv_layer = mesh.uv_layers.active
         if not uv_layer:
             self.report({'WARNING'}, "No active UV layer found")
             return {'CANCELLED'}
-        
-        for face in bm.faces:
-            for loop in face.loops:
-                uv = loop[uv_layer].uv
-                tile_x = int(uv.x * 10)
-                tile_y = int(uv.y * 10)
 
-                if (tile_x, tile_y) not in tile_dict:
-                    tile_dict[(tile_x, tile_y)] = set()
-                tile_dict[(tile_x, tile_y)].add(face.index)
-
-        bpy.ops.object.mode_set(mode='OBJECT')
+        tile_dict = _uv_tile_buckets(mesh)
 
         if not tile_dict:
             self.report({'INFO'}, "No UV tile regions found in the mesh.")
             return {'CANCELLED'}
 
-        # Step 4: Process tiles and export them as FBX
-        exported_objects = []
-        for tile_x, tile_y in sorted(tile_dict.keys()):
-            bpy.ops.object.mode_set(mode='EDIT')
-            bm = bmesh.from_edit_mesh(mesh)
+        # Step 4: Build one object per tile from a single bmesh of the source mesh
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
+        bm.faces.ensure_lookup_table()
 
-            bpy.ops.mesh.select_all(action='DESELECT')
+        # Geometry-free copy that keeps the source's data layers (UVs, colors, ...)
+        empty_bm = bm.copy()
+        bmesh.ops.delete(empty_bm, geom=empty_bm.verts[:], context='VERTS')
 
-            for face in bm.faces:
-                if face.index in tile_dict[(tile_x, tile_y)]:
-                    face.select = True
-
-            bmesh.update_edit_mesh(mesh)
-            bpy.ops.mesh.duplicate()
-            bpy.ops.mesh.separate(type='SELECTED')
-            bpy.ops.object.mode_set(mode='OBJECT')
-
-            new_obj = bpy.context.selected_objects[-1]
-            new_obj.name = f"{blend_name}_s{tile_x}{tile_y}"
+        exported_objects = []
+        for tile_x, tile_y in sorted(tile_dict.keys()):
+            # Duplicate only the tile's faces (and the verts/edges they use) into their own bmesh
+            tile_bm = empty_bm.copy()
+            tile_faces = [bm.faces[i] for i in tile_dict[(tile_x, tile_y)].tolist()]
+            bmesh.ops.duplicate(bm, geom=tile_faces, dest=tile_bm)
+
+            tile_name = f"{blend_name}_s{tile_x}{tile_y}"
+            tile_mesh = bpy.data.meshes.new(tile_name)
+            tile_bm.to_mesh(tile_mesh)
+            tile_bm.free()
+            for mat in mesh.materials:
+                tile_mesh.materials.append(mat)
+
+            new_obj = obj.copy()
+            new_obj.data = tile_mesh
+            new_obj.name = tile_name
+            for collection in obj.users_collection:
+                collection.objects.link(new_obj)
             exported_objects.append(new_obj)
 
+        empty_bm.free()
+        bm.free()
+
         for new_obj in exported_objects:
             export_path = os.path.join(export_dir, f"{new_obj.name}.fbx")
             #def_path = os.path.join(export_dir, f"{new_obj.name}.def")
 
-            bpy.ops.object.select_all(action='DESELECT')
-            new_obj.select_set(True)
-            bpy.context.view_layer.objects.active = new_obj
-            bpy.ops.export_scene.fbx(filepath=export_path, use_selection=True)
+            if hasattr(bpy.context, "temp_override"):
+                # Blender 3.2+: hand the exporter its selection without touching the scene's
+                with bpy.context.temp_override(selected_objects=[new_obj], selected_editable_objects=[new_obj],
+                                               active_object=new_obj):
+                    bpy.ops.export_scene.fbx(filepath=export_path, use_selection=True)
+            else:
+                bpy.ops.object.select_all(action='DESELECT')
+                new_obj.select_set(True)
+                bpy.context.view_layer.objects.active = new_obj
+                bpy.ops.export_scene.fbx(filepath=export_path, use_selection=True)
 
             #open(def_path, 'w').close()
 
-        bpy.ops.object.select_all(action='DESELECT')
+        # Remove the temporary tile objects along with their meshes
         for new_obj in exported_objects:
-            new_obj.select_set(True)
-        bpy.ops.object.delete()
+            tile_mesh = new_obj.data
+            bpy.data.objects.remove(new_obj, do_unlink=True)
+            bpy.data.meshes.remove(tile_mesh)
         obj.hide_set(False)
 
         self.report({'INFO'}, f"Exported {len(exported_objects)} meshes to {export_dir}.")
@@ -377,31 +646,23 @@ class SelectUVTileOperator(Operator):
             self.report({'WARNING'}, "No valid mesh object selected")
             return {'CANCELLED'}
         
-        bpy.ops.object.mode_set(mode='EDIT')
         mesh = obj.data
-        bm = bmesh.from_edit_mesh(mesh)
-
-        uv_layer = bm.loops.layers.uv.active
-        if not uv_layer:
+        if not mesh.uv_layers.active:
             self.report({'WARNING'}, "No active UV layer found")
             return {'CANCELLED'}
         
         mat = obj.active_material
-        texture = None
-        if mat and mat.use_nodes:
-            for node in mat.node_tree.nodes:
-                if node.type == 'TEX_IMAGE' and node.image:
-                    texture = node.image
-                    break
+        texture = _material_texture(mat) if mat else None
         
         if not texture:
             self.report({'WARNING'}, "No texture image found")
             return {'CANCELLED'}
         
-        tex_width, tex_height = texture.size[:2]
+        _, tex_width, tex_height = texture
         tile_x, tile_y = uv_props.tile_x, uv_props.tile_y
 
-        print(f"Texture size: {tex_width}x{tex_height}")
+        if DEBUG:
+            print(f"Texture size: {tex_width}x{tex_height}")
 
         # **Corrected UV Calculation**
         tile_size = 128  # Each tile is 128px
@@ -422,25 +683,33 @@ class SelectUVTileOperator(Operator):
         uv_y_min = 1 - ((padding + (tile_y + 1) * tile_size + tile_y * padding) / tex_height)
         uv_y_max = 1 - ((padding + tile_y * (tile_size + padding)) / tex_height)
 
-        print(f"Selecting UVs in Tile ({tile_x}, {tile_y}): X({uv_x_min:.4f} - {uv_x_max:.4f}), Y({uv_y_min:.4f} - {uv_y_max:.4f})")
+        if DEBUG:
+            print(f"Selecting UVs in Tile ({tile_x}, {tile_y}): X({uv_x_min:.4f} - {uv_x_max:.4f}), Y({uv_y_min:.4f} - {uv_y_max:.4f})")
 
         # **Selection Logic**
-        selected_count = 0
-        for face in bm.faces:
-            face_selected = False
-            for loop in face.loops:
-                uv = loop[uv_layer].uv
-                if uv_x_min <= uv.x <= uv_x_max and uv_y_min <= uv.y <= uv_y_max:
-                    face_selected = True
-                    break
-
-            if face_selected:
-                for v in face.verts:
-                    v.select = True  # Add to selection
-                selected_count += 1
-
-        print(f"Number of faces selected: {selected_count}")
-        bmesh.update_edit_mesh(mesh)
+        # Scan in Object mode, where loop UVs and vertex flags can be read in bulk
+        bpy.ops.object.mode_set(mode='OBJECT')
+        uvs = _read_uvs(mesh).astype(np.float64)  # Compare in double precision, like Python floats
+        u, v = uvs[:, 0], uvs[:, 1]
+        inside = (u >= uv_x_min) & (u <= uv_x_max) & (v >= uv_y_min) & (v <= uv_y_max)
+
+        # A face is selected when any of its loops lies inside the tile
+        loop_face = _loop_face_indices(mesh)
+        face_mask = np.zeros(len(mesh.polygons), dtype=bool)
+        face_mask[loop_face[inside]] = True
+        selected_count = int(face_mask.sum())
+
+        # Add the vertices of those faces to the selection
+        loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_verts)
+        vert_select = np.zeros(len(mesh.vertices), dtype=bool)
+        mesh.vertices.foreach_get("select", vert_select)
+        vert_select[loop_verts[face_mask[loop_face]]] = True
+        mesh.vertices.foreach_set("select", vert_select)
+
+        if DEBUG:
+            print(f"Number of faces selected: {selected_count}")
+        bpy.ops.object.mode_set(mode='EDIT')
 
         if selected_count == 0:
             self.report({'INFO'}, "No UVs were selected. Check UV layout.")
@@ -451,42 +720,49 @@ class SelectUVTileOperator(Operator):
 
 def smooth_selected_voxel_terrain(smoothing_factor):
     obj = bpy.context.active_object
-    bpy.ops.object.mode_set(mode='EDIT')  # Ensure we are in edit mode
+    bpy.ops.object.mode_set(mode='OBJECT')  # Flush pending edits to the mesh data
     mesh = obj.data
-    bm = bmesh.from_edit_mesh(mesh)
+    num_verts = len(mesh.vertices)
 
-    selected_verts = [v for v in bm.verts if v.select]
+    sel_mask = np.zeros(num_verts, dtype=bool)
+    mesh.vertices.foreach_get("select", sel_mask)
 
-    if not selected_verts:
-        print("No vertices selected. Skipping smoothing.")
+    if not sel_mask.any():
+        bpy.ops.object.mode_set(mode='EDIT')
+        if DEBUG:
+            print("No vertices selected. Skipping smoothing.")
         return
 
-    for v in selected_verts:
-        neighbors = []
-        for e in v.link_edges:
-            other_v = e.other_vert(v)
-            if other_v.select and (v.co - other_v.co).length < 1.5:  # Adjust for voxel size
-                neighbors.append(other_v.co)
-
-        if neighbors:
-            # Calculate the height gradient (focus on the Z-axis)
-            avg_pos = Vector((sum(n.x for n in neighbors) / len(neighbors),
-                              sum(n.y for n in neighbors) / len(neighbors),
-                              sum(n.z for n in neighbors) / len(neighbors)))
-            
-            # Apply a hill-like smoothing effect by adjusting the Z-coordinate more significantly
-            # The closer the neighbor, the more it influences the smoothing
-            distance_factors = [1 / (v.co - n).length for n in neighbors]  # Inverse distance as weight
-            total_weight = sum(distance_factors)
-            weighted_avg = Vector((0, 0, 0))
-            for i, n in enumerate(neighbors):
-                weighted_avg += n * distance_factors[i]
-            weighted_avg /= total_weight
-
-            # Blend toward the weighted average
-            v.co = v.co.lerp(weighted_avg, smoothing_factor)
-
-    bmesh.update_edit_mesh(mesh)
+    co = _f32(num_verts * 3)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(num_verts, 3)
+
+    # Every (vertex, neighbor) pair, in CSR order
+    indptr, indices, deg = _edge_csr(mesh)
+    rows = np.repeat(np.arange(num_verts), deg)
+
+    # Only selected neighbors within voxel range count (adjust for voxel size).
+    # Compare squared distances so only the pairs that are kept need a sqrt
+    pairs = np.flatnonzero(sel_mask[rows] & sel_mask[indices])
+    delta = co[rows[pairs]] - co[indices[pairs]]
+    dist_sq = (delta * delta).sum(axis=1)
+    near = (dist_sq < 2.25) & (dist_sq > 0)  # 2.25 = 1.5 ** 2
+    pairs = pairs[near]
+
+    # The closer the neighbor, the more it influences the smoothing
+    weights = np.zeros(len(indices), dtype=np.float32)
+    weights[pairs] = 1.0 / np.sqrt(dist_sq[near])  # Inverse distance as weight
+
+    total_weight = _csr_sum(weights, indptr, deg)
+    weighted_sum = _csr_sum(co[indices] * weights[:, None], indptr, deg)
+    has_neighbors = total_weight > 0
+    weighted_avg = weighted_sum[has_neighbors] / total_weight[has_neighbors, None]
+
+    # Blend toward the weighted average
+    co[has_neighbors] += (weighted_avg - co[has_neighbors]) * smoothing_factor
+
+    _write_positions(mesh, co)
+    bpy.ops.object.mode_set(mode='EDIT')
 
 
 def register():
@@ -498,6 +774,11 @@ def register():
     bpy.utils.register_class(QuickExportFBXOperator)
     bpy.utils.register_class(AutoSculptTerrainOperator)
     bpy.types.VIEW3D_MT_edit_mesh.append(menu_func)
+    bpy.app.handlers.depsgraph_update_post.append(_invalidate_tex_cache)
+    bpy.app.handlers.undo_post.append(_invalidate_tex_cache)
+    bpy.app.handlers.load_post.append(_invalidate_tex_cache)
+    bpy.app.handlers.undo_post.append(_clear_csr_cache)
+    bpy.app.handlers.load_post.append(_clear_csr_cache)
     
     
     
@@ -520,6 +801,13 @@ def unregister():
     bpy.utils.unregister_class(QuickExportFBXOperator)
     bpy.utils.unregister_class(AutoSculptTerrainOperator)
     bpy.types.VIEW3D_MT_edit_mesh.remove(menu_func)
+    bpy.app.handlers.depsgraph_update_post.remove(_invalidate_tex_cache)
+    bpy.app.handlers.undo_post.remove(_invalidate_tex_cache)
+    bpy.app.handlers.load_post.remove(_invalidate_tex_cache)
+    bpy.app.handlers.undo_post.remove(_clear_csr_cache)
+    bpy.app.handlers.load_post.remove(_clear_csr_cache)
+    _tex_cache.clear()
+    _csr_cache.clear()
     
     del bpy.types.Scene.uv_tile_props
     del bpy.types.Scene.smoothing_factor